@@ -1,8 +1,11 @@
 import argparse
+import functools
+import mmap
+import os
 import sys
 import re
+import string
 from pathlib import Path
-from typing import Iterable, List
 
 # ------------------------------------------------------------
 # Font & regex constants
@@ -12,10 +15,28 @@ FONT_STACK = (
     "monospace",                # ultimate fallback
 )
 
-MD_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
-URL_RE = re.compile(
-    r"(https?://[^\s<>\"']+|ftp://[^\s<>\"']+|www\.[^\s<>\"']+|[\w\-]+\.[a-zA-Z]{2,}(?:/[^\s<>\"']*)?)"
+# Markdown links and bare URLs are matched in a single alternation; the text
+# between matches is escaped in bulk. The (?<![\w\-]) lookbehind lets a bare
+# domain start only at the beginning of a word run; without it, a long run
+# with no dot is rescanned from every position (quadratic backtracking).
+TOKEN_RE = re.compile(
+    r"(?P<md>\[(?P<md_text>[^\]]+)\]\((?P<md_url>[^)]+)\))"
+    r"|(?P<url>https?://[^\s<>\"']+|ftp://[^\s<>\"']+|www\.[^\s<>\"']+|(?<![\w\-])[\w\-]+\.[a-zA-Z]{2,}(?:/[^\s<>\"']*)?)"
 )
+
+# Inputs at least this large are decoded from a read-only mmap.
+_MMAP_THRESHOLD = 1 << 20
+
+# Static page shell, joined around the title, CSS and body of each page.
+_HTML_HEAD = (
+    "<!DOCTYPE html><html lang='en'><head>"
+    "<meta charset='UTF-8'><meta name='viewport' content='width=device-width, initial-scale=1.0'>"
+    "<title>"
+)
+_HTML_STYLE = "</title><style>"
+_HTML_BODY = "</style></head><body><pre class='content'>"
+_HTML_TAIL = "</pre></body></html>"
+
 # ------------------------------------------------------------
 # Utility helpers
 # ------------------------------------------------------------
@@ -28,97 +49,151 @@ def _font_css_list() -> str:
     return ", ".join(f'"{f}"' if " " in f else f for f in FONT_STACK)
 
 
-def _build_css(cell_width: float) -> str:
-    # letter‑spacing is positive when >1, negative when <1
-    letter_spacing = cell_width - 1.0
-    return f"""
-body {{
+_CSS_TEMPLATE = string.Template("""
+body {
   margin:0; padding:20px; display:flex; justify-content:center;
   min-height:100vh; background:#fff;
-}}
+}
 
-.content {{
-  font-family: {_font_css_list()};
+.content {
+  font-family: $font_family;
   font-size:28px; line-height:1em;           /* 1 terminal row per glyph */
   white-space:pre; word-spacing:0;           /* keep grid */
-  letter-spacing:{letter_spacing:.4f}em;     /* WezTerm cell_width */
+  letter-spacing:${letter_spacing}em;     /* WezTerm cell_width */
   font-variant-ligatures:none; font-kerning:none;
   -webkit-font-smoothing:none; -moz-osx-font-smoothing:unset;
   text-rendering:optimizeSpeed;
   width:80ch;
-}}
+}
+
+@media (max-width:85ch) {
+  .content{width:100%;max-width:80ch;}
+}
+@media (max-width:768px) {
+  .content{font-size:20px;}
+}
+""")
+
 
-@media (max-width:85ch) {{
-  .content{{width:100%;max-width:80ch;}}
-}}
-@media (max-width:768px) {{
-  .content{{font-size:20px;}}
-}}
-"""
+@functools.lru_cache(maxsize=None)
+def _build_css(cell_width: float) -> str:
+    # letter‑spacing is positive when >1, negative when <1
+    letter_spacing = cell_width - 1.0
+    return _CSS_TEMPLATE.substitute(
+        font_family=_font_css_list(), letter_spacing=f"{letter_spacing:.4f}"
+    )
 
 # ------------------------------------------------------------
 # Core transformation
 # ------------------------------------------------------------
 
-def _to_html(src_text: str, title: str, cell_width: float) -> str:
-    md_links: List[str] = []
+@functools.lru_cache(maxsize=1024)
+def _build_anchor(href: str, text: str) -> str:
+    # [https://x](https://x) and bare "https://x" URLs show their own href.
+    if text == href:
+        escaped = _html_escape(href)
+        return f'<a href="{escaped}" target="_blank">{escaped}</a>'
+    return f'<a href="{_html_escape(href)}" target="_blank">{_html_escape(text)}</a>'
+
 
-    def _cache_md(m: re.Match[str]) -> str:
-        text, url = m.group(1), m.group(2)
+def _render_token(m: re.Match[str]) -> str:
+    if m.lastgroup == "md":
+        text, url = m.group("md_text"), m.group("md_url")
         if not url.startswith(("http://", "https://", "ftp://", "mailto:")):
             url = url.lstrip("/") + (".html" if not url.endswith(".html") else "")
-        placeholder = f"§§MD{len(md_links)}§§"
-        md_links.append(f'<a href="{url}" target="_blank">{text}</a>')
-        return placeholder
-
-    processed = MD_LINK_RE.sub(_cache_md, src_text)
-
-    lit_links: List[str] = []
-
-    def _cache_url(m: re.Match[str]) -> str:
-        url = m.group(0)
-        if "§§MD" in url:
-            return url
-        href = url if url.startswith(("http://", "https://", "ftp://")) else f"http://{url}"
-        placeholder = f"§§LIT{len(lit_links)}§§"
-        lit_links.append(f'<a href="{href}" target="_blank">{url}</a>')
-        return placeholder
-
-    processed = URL_RE.sub(_cache_url, processed)
-    processed = _html_escape(processed)
-
-    for i, link in enumerate(md_links):
-        processed = processed.replace(f"§§MD{i}§§", link)
-    for i, link in enumerate(lit_links):
-        processed = processed.replace(f"§§LIT{i}§§", link)
-
-    css = _build_css(cell_width)
-    return (
-        "<!DOCTYPE html><html lang='en'><head>"
-        "<meta charset='UTF-8'><meta name='viewport' content='width=device-width, initial-scale=1.0'>"
-        f"<title>{title}</title><style>{css}</style></head><body><pre class='content'>{processed}</pre></body></html>"
-    )
+        return _build_anchor(url, text)
+    url = m.group("url")
+    href = url if url.startswith(("http://", "https://", "ftp://")) else f"http://{url}"
+    return _build_anchor(href, url)
+
+
+def _to_html(src_text: str, title: str, cell_width: float) -> str:
+    parts = [_HTML_HEAD, title, _HTML_STYLE, _build_css(cell_width), _HTML_BODY]
+    # Every link form needs "](", "://" or a dot; plain text (e.g. braille
+    # art) only needs escaping.
+    if "](" in src_text or "://" in src_text or "." in src_text:
+        last = 0
+        for m in TOKEN_RE.finditer(src_text):
+            parts.append(_html_escape(src_text[last:m.start()]))
+            parts.append(_render_token(m))
+            last = m.end()
+        parts.append(_html_escape(src_text[last:]))
+    else:
+        parts.append(_html_escape(src_text))
+    parts.append(_HTML_TAIL)
+    return "".join(parts)
 
 # ------------------------------------------------------------
 # Compile helpers
 # ------------------------------------------------------------
 
-def _compile_one(src: Path, dst: Path, *, title: str | None, cw: float) -> None:
+def _read_source(src: Path) -> str:
+    with open(src, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _MMAP_THRESHOLD:
+            text = f.read().decode("utf-8")
+        else:
+            # Decode straight from the page cache instead of a heap copy of the bytes.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, "utf-8")
+    # Universal newlines, as read_text() did; a no-op when there is no CR.
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _compile_one(
+    src: Path, dst: Path, *, title: str | None, cw: float, make_parent: bool = True
+) -> None:
     if not src.exists():
         raise FileNotFoundError(src)
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    html = _to_html(src.read_text("utf-8"), title or src.stem, cw)
-    dst.write_text(html, "utf-8")
+    if make_parent:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+    html = _to_html(_read_source(src), title or src.stem, cw)
+    dst.write_bytes(html.encode("utf-8"))
     print(f"✔ {src.relative_to(src.parent)} → {dst.relative_to(dst.parent)}")
 
 
+def _find_markdown(root: Path) -> list[Path]:
+    # One scandir walk for both suffixes; like rglob, symlinked dirs are not
+    # entered and unreadable dirs are skipped.
+    found: list[Path] = []
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith((".md", ".markdown")) and entry.is_file():
+                        found.append(Path(entry.path))
+        except PermissionError:
+            continue
+    return found
+
+
+def _compile_job(job: tuple[Path, Path, float]) -> None:
+    src, dst, cw = job
+    _compile_one(src, dst, title=None, cw=cw, make_parent=False)
+
+
 def _compile_dir(src_dir: Path, dst_dir: Path, *, cw: float) -> None:
-    md_files: Iterable[Path] = list(src_dir.rglob("*.md")) + list(src_dir.rglob("*.markdown"))
+    md_files = _find_markdown(src_dir)
     if not md_files:
         raise FileNotFoundError("No markdown files found.")
-    for f in md_files:
-        rel = f.relative_to(src_dir).with_suffix(".html")
-        _compile_one(f, dst_dir / rel, title=None, cw=cw)
+    jobs = [(f, dst_dir / f.relative_to(src_dir).with_suffix(".html"), cw) for f in md_files]
+    # Create each output directory once here instead of once per file.
+    for parent in {dst.parent for _, dst, _ in jobs}:
+        parent.mkdir(parents=True, exist_ok=True)
+    cpus = os.cpu_count() or 1
+    if len(jobs) == 1 or cpus == 1:
+        for job in jobs:
+            _compile_job(job)
+        return
+    # Files are independent, so fan them out across processes.
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(jobs) // (4 * cpus))
+    with ProcessPoolExecutor(max_workers=min(len(jobs), cpus)) as pool:
+        list(pool.map(_compile_job, jobs, chunksize=chunksize))
 
 # ------------------------------------------------------------
 # CLI